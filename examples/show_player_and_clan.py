@@ -1,66 +1,77 @@
 import os
 import json
+import asyncio
 from dotenv import load_dotenv
 
-from cocpy import COCClient
-from cocpy.errors import COCAPIError, AuthError, NotFoundError
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-import json 
+from cocpy import AsyncCOCClient
+from cocpy.errors import COCAPIError, AuthError, NotFoundError
 
 PLAYER_TAG = "#QPL0GRQLR"   # Quadrigesimo
 CLAN_TAG = "#2GPVUQYPJ"
 
+def _dumps(data):
+    # serialize once to UTF-8 bytes, reused for both the console and the file
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
 def dump(title, data):
-    print(f"\n=== {title} ===")
-    print(json.dumps(data, indent=2, ensure_ascii=False))
+    out = _dumps(data)
+    print(f"\n=== {title} ===\n{out.decode('utf-8')}")
 
-    with open(f"output_{title}.json", "a", encoding="utf-8") as f:
-        # f.write(f"\n=== {title} ===\n")
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(f"output_{title}.json", "ab") as f:
+        f.write(out)
 
-def safe_call(title, fn, *args, **kwargs):
-    try:
-        data = fn(*args, **kwargs)
-        dump(title, data)
-        return data
-    except (AuthError, NotFoundError) as e:
+def report(title, result):
+    if isinstance(result, (AuthError, NotFoundError)):
         print(f"\n=== {title} ===")
-        print(f"{e.__class__.__name__}: {e}")
-    except COCAPIError as e:
+        print(f"{result.__class__.__name__}: {result}")
+        return None
+    if isinstance(result, COCAPIError):
         print(f"\n=== {title} ===")
-        print(f"COCAPIError: {e}")
+        print(f"COCAPIError: {result}")
+        return None
+    if isinstance(result, BaseException):
+        raise result
+    dump(title, result)
+    return result
 
-def main():
+async def main():
     load_dotenv()
     token = os.getenv("COC_TOKEN")
     if not token:
         raise SystemExit("COC_TOKEN mancante in .env")
 
-    client = COCClient(token, timeout=20.0, max_retries=2, backoff=0.2)
-
-    # Player
-    safe_call(f"Player {PLAYER_TAG}", client.get_player, PLAYER_TAG)
-
-    # Clan core
-    safe_call(f"Clan {CLAN_TAG}", client.get_clan, CLAN_TAG)
-    safe_call("Clan members (limit=50)", client.list_clan_members, CLAN_TAG, limit=50)
-    safe_call("Clan warlog (limit=20)", client.get_clan_warlog, CLAN_TAG, limit=20)
-
-    # Current war
-    cw = safe_call("Current war", client.get_current_war, CLAN_TAG)
-
-    # CWL group and one war from it (if available)
-    cwl = safe_call("Current War League group", client.get_current_war_league_group, CLAN_TAG)
-    if isinstance(cwl, dict):
-        war_tags = []
-        for rnd in cwl.get("rounds", []):
-            war_tags.extend([wt for wt in rnd.get("warTags", []) if wt and wt != "#0"])
-        war_tags = list(dict.fromkeys(war_tags))  # unique, preserve order
-        if war_tags:
-            safe_call(f"CWL war {war_tags[0]}", client.get_cwl_war, war_tags[0])
+    async with AsyncCOCClient(token, timeout=20.0, max_retries=2, backoff=0.2) as client:
+        # independent calls: fire them together, print in a stable order
+        calls = {
+            f"Player {PLAYER_TAG}": client.get_player(PLAYER_TAG),
+            f"Clan {CLAN_TAG}": client.get_clan(CLAN_TAG),
+            "Clan members (limit=50)": client.list_clan_members(CLAN_TAG, limit=50),
+            "Clan warlog (limit=20)": client.get_clan_warlog(CLAN_TAG, limit=20),
+            "Current war": client.get_current_war(CLAN_TAG),
+            "Current War League group": client.get_current_war_league_group(CLAN_TAG),
+            "Capital raid seasons (limit=5)": client.get_clan_capital_raid_seasons(CLAN_TAG, limit=5),
+        }
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        out = {title: report(title, res) for title, res in zip(calls, results)}
 
-    # Capital raid seasons
-    safe_call("Capital raid seasons (limit=5)", client.get_clan_capital_raid_seasons, CLAN_TAG, limit=5)
+        # one war from the CWL group (if available) depends on the group result
+        cwl = out["Current War League group"]
+        if isinstance(cwl, dict):
+            war_tags = []
+            for rnd in cwl.get("rounds", []):
+                war_tags.extend([wt for wt in rnd.get("warTags", []) if wt and wt != "#0"])
+            war_tags = list(dict.fromkeys(war_tags))  # unique, preserve order
+            if war_tags:
+                title = f"CWL war {war_tags[0]}"
+                res = await asyncio.gather(client.get_cwl_war(war_tags[0]), return_exceptions=True)
+                report(title, res[0])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
@@ -1,10 +1,16 @@
-from .client import COCClient
+from .client import COCClient, ItemStream
+from .async_client import AsyncCOCClient
 from .errors import COCAPIError, RateLimitError, NotFoundError, AuthError
+from .resolver import enable_dns_cache, disable_dns_cache
 
 __all__ = [
     "COCClient",
+    "ItemStream",
+    "AsyncCOCClient",
     "COCAPIError",
     "RateLimitError",
     "NotFoundError",
     "AuthError",
+    "enable_dns_cache",
+    "disable_dns_cache",
 ]
\ No newline at end of file
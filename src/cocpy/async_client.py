@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore[assignment]
+
+from .client import COCClient, _ETagCache, _Memo, _STATUS_ERRORS, _dumps, _loads, _make_bucket, _opt_int, _ttl_cache
+from .errors import COCAPIError, RateLimitError
+
+
+class AsyncCOCClient:
+    """
+    Asyncio client for the Clash of Clans REST API.
+
+    Same endpoints as COCClient, but every method is a coroutine, so
+    independent calls can run concurrently with asyncio.gather.
+    Requires httpx: pip install "cocpysdk[async]"
+    """
+
+    _encode_tag = staticmethod(COCClient._encode_tag)
+    _kv = staticmethod(COCClient._kv)
+    _paging_params = staticmethod(COCClient._paging_params)
+    _parse_retry_after = staticmethod(COCClient._parse_retry_after)
+    _backoff_delay = COCClient._backoff_delay
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        base_url: str = "https://api.clashofclans.com/v1",
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.75,
+        max_delay: float = 30.0,
+        client: Optional["httpx.AsyncClient"] = None,
+        cache: bool = True,
+        rate_limit: Optional[float] = 10.0,
+    ) -> None:
+        if httpx is None:
+            raise ImportError('AsyncCOCClient requires httpx: pip install "cocpysdk[async]"')
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self._cache = _ETagCache() if cache else None
+        self._memo = _Memo() if cache else None
+        self._inflight: Dict[Tuple[str, str], List[Any]] = {}  # key -> [task, followers]
+        # requests/second paced on our side; None disables the limiter
+        self._bucket = _make_bucket(rate_limit)
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+        )
+        self._client.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "User-Agent": "cocpy/0.1.0",
+        })
+
+    async def aclose(self) -> None:
+        """Close the underlying httpx.AsyncClient (only if created by us)."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncCOCClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    # --- public: players ----------------------------------------------------
+
+    async def get_player(self, tag: str) -> Dict[str, Any]:
+        """GET /players/{playerTag}"""
+        path = f"/players/{self._encode_tag(tag)}"
+        return await self._request("GET", path)
+
+    async def verify_player_token(self, tag: str, player_token: str) -> Dict[str, Any]:
+        """POST /players/{playerTag}/verifytoken"""
+        path = f"/players/{self._encode_tag(tag)}/verifytoken"
+        payload = {"token": player_token}
+        return await self._request("POST", path, json=payload)
+
+    # --- public: clans ------------------------------------------------------
+
+    async def search_clans(
+        self,
+        *,
+        name: Optional[str] = None,
+        war_frequency: Optional[str] = None,
+        location_id: Optional[int] = None,
+        min_members: Optional[int] = None,
+        max_members: Optional[int] = None,
+        min_clan_points: Optional[int] = None,
+        min_clan_level: Optional[int] = None,
+        label_ids: Optional[str] = None,  # comma separated ids
+        limit: Optional[int] = None,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """GET /clans with filters"""
+        params = self._kv(
+            name=name,
+            warFrequency=war_frequency,
+            locationId=_opt_int(location_id),
+            minMembers=_opt_int(min_members),
+            maxMembers=_opt_int(max_members),
+            minClanPoints=_opt_int(min_clan_points),
+            minClanLevel=_opt_int(min_clan_level),
+            labelIds=label_ids,
+        )
+        params.update(self._paging_params(limit=limit, after=after, before=before))
+        return await self._request("GET", "/clans", params=params or None)
+
+    async def get_clan(self, tag: str) -> Dict[str, Any]:
+        """GET /clans/{clanTag}"""
+        return await self._request("GET", f"/clans/{self._encode_tag(tag)}")
+
+    async def list_clan_members(
+        self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /clans/{clanTag}/members"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/clans/{self._encode_tag(tag)}/members", params=params or None)
+
+    async def get_clan_warlog(
+        self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /clans/{clanTag}/warlog"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/clans/{self._encode_tag(tag)}/warlog", params=params or None)
+
+    async def get_current_war(self, tag: str) -> Dict[str, Any]:
+        """GET /clans/{clanTag}/currentwar"""
+        return await self._request("GET", f"/clans/{self._encode_tag(tag)}/currentwar")
+
+    async def get_current_war_league_group(self, tag: str) -> Dict[str, Any]:
+        """GET /clans/{clanTag}/currentwar/leaguegroup"""
+        return await self._request("GET", f"/clans/{self._encode_tag(tag)}/currentwar/leaguegroup")
+
+    async def get_clan_capital_raid_seasons(
+        self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /clans/{clanTag}/capitalraidseasons"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/clans/{self._encode_tag(tag)}/capitalraidseasons", params=params or None)
+
+    # --- public: clan war leagues ------------------------------------------
+
+    async def get_cwl_war(self, war_tag: str) -> Dict[str, Any]:
+        """GET /clanwarleagues/wars/{warTag}"""
+        return await self._request("GET", f"/clanwarleagues/wars/{self._encode_tag(war_tag)}")
+
+    # --- public: leagues ----------------------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def list_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /leagues"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/leagues", params=params or None)
+
+    @_ttl_cache(ttl=3600)
+    async def get_league(self, league_id: int | str) -> Dict[str, Any]:
+        """GET /leagues/{leagueId}"""
+        return await self._request("GET", f"/leagues/{league_id}")
+
+    async def get_league_seasons(
+        self, league_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /leagues/{leagueId}/seasons"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/leagues/{league_id}/seasons", params=params or None)
+
+    async def get_league_season_rankings(
+        self, league_id: int | str, season_id: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /leagues/{leagueId}/seasons/{seasonId}"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/leagues/{league_id}/seasons/{season_id}", params=params or None)
+
+    # --- public: war leagues -----------------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def list_war_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /warleagues"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/warleagues", params=params or None)
+
+    @_ttl_cache(ttl=3600)
+    async def get_war_league(self, league_id: int | str) -> Dict[str, Any]:
+        """GET /warleagues/{leagueId}"""
+        return await self._request("GET", f"/warleagues/{league_id}")
+
+    # --- public: capital leagues -------------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def list_capital_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /capitalleagues"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/capitalleagues", params=params or None)
+
+    @_ttl_cache(ttl=3600)
+    async def get_capital_league(self, league_id: int | str) -> Dict[str, Any]:
+        """GET /capitalleagues/{leagueId}"""
+        return await self._request("GET", f"/capitalleagues/{league_id}")
+
+    # --- public: builder base leagues --------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def list_builder_base_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /builderbaseleagues"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/builderbaseleagues", params=params or None)
+
+    @_ttl_cache(ttl=3600)
+    async def get_builder_base_league(self, league_id: int | str) -> Dict[str, Any]:
+        """GET /builderbaseleagues/{leagueId}"""
+        return await self._request("GET", f"/builderbaseleagues/{league_id}")
+
+    # --- public: locations --------------------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def list_locations(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /locations"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/locations", params=params or None)
+
+    @_ttl_cache(ttl=3600)
+    async def get_location(self, location_id: int | str) -> Dict[str, Any]:
+        """GET /locations/{locationId}"""
+        return await self._request("GET", f"/locations/{location_id}")
+
+    # rankings: players
+    async def get_location_player_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/players"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/players", params=params or None)
+
+    async def get_location_player_builder_base_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/players-builder-base (Builder Base)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/players-builder-base", params=params or None)
+
+    async def get_location_player_versus_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/players-versus (deprecated)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/players-versus", params=params or None)
+
+    # rankings: clans
+    async def get_location_clan_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/clans"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/clans", params=params or None)
+
+    async def get_location_clan_builder_base_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/clans-builder-base (Builder Base)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/clans-builder-base", params=params or None)
+
+    async def get_location_clan_versus_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/clans-versus (deprecated)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/clans-versus", params=params or None)
+
+    # rankings: capitals
+    async def get_location_capital_rankings(
+        self, location_id: int | str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """GET /locations/{locationId}/rankings/capitals"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", f"/locations/{location_id}/rankings/capitals", params=params or None)
+
+    # --- public: labels -----------------------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def list_player_labels(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /labels/players"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/labels/players", params=params or None)
+
+    @_ttl_cache(ttl=3600)
+    async def list_clan_labels(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
+        """GET /labels/clans"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return await self._request("GET", "/labels/clans", params=params or None)
+
+    # --- public: gold pass --------------------------------------------------
+
+    @_ttl_cache(ttl=3600)
+    async def get_current_goldpass_season(self) -> Dict[str, Any]:
+        """GET /goldpass/seasons/current"""
+        return await self._request("GET", "/goldpass/seasons/current")
+
+    # --- internals ----------------------------------------------------------
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        url = self.base_url + path
+        if method != "GET":
+            return await self._fetch(method, url, params, json)
+
+        # single-flight: concurrent identical GETs await the same task;
+        # shield it so one caller being cancelled does not cancel the others.
+        # Followers decode their own copy of the result.
+        key = _ETagCache.key(method, url, params)
+        entry = self._inflight.get(key)
+        leader = entry is None
+        if leader:
+            entry = self._inflight[key] = [None, 0]
+            entry[0] = asyncio.ensure_future(self._fetch_shared(key, entry, url, params))
+        else:
+            entry[1] += 1
+        data, encoded = await asyncio.shield(entry[0])
+        return data if leader else _loads(encoded)
+
+    async def _fetch_shared(
+        self, key: Tuple[str, str], entry: List[Any], url: str, params: Optional[Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        try:
+            data = await self._fetch("GET", url, params, None)
+        finally:
+            self._inflight.pop(key, None)
+        # encoded here, before the leader's caller can modify the result
+        return data, (_dumps(data) if entry[1] else None)
+
+    async def _fetch(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        last_exc: Optional[Exception] = None
+
+        cache_key = _ETagCache.key(method, url, params) if self._cache is not None and method == "GET" else None
+        cached = self._cache.get(cache_key) if cache_key is not None else None
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        for attempt in range(self.max_retries + 1):
+            if self._bucket is not None:
+                wait = self._bucket.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            try:
+                resp = await self._client.request(
+                    method, url, params=params, json=json, headers=headers, timeout=self.timeout
+                )
+                status = resp.status_code
+                if status < 400:
+                    if self._bucket is not None:
+                        self._bucket.on_success()
+                    if status == 304 and cached:
+                        return _loads(cached[1])
+                    body = resp.content
+                    etag = resp.headers.get("etag")
+                    if cache_key is not None and etag:
+                        self._cache.put(cache_key, etag, body)
+                    return _loads(body)
+
+                if status == 429:
+                    if self._bucket is not None:
+                        self._bucket.on_throttled()
+                    if attempt == self.max_retries:
+                        raise RateLimitError("Rate limit exceeded")
+                    delay = self._parse_retry_after(resp.headers.get("retry-after")) or self._backoff_delay(attempt)
+                    await asyncio.sleep(delay)
+                    continue
+
+                if status >= 500 and attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff_delay(attempt))
+                    continue
+
+                text = resp.text
+                exc = _STATUS_ERRORS.get(status)
+                if exc is not None:
+                    raise exc(text)
+                raise COCAPIError(f"{status}: {text}")
+
+            except (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+                last_exc = e
+                if attempt == self.max_retries:
+                    raise COCAPIError(str(e)) from e
+                await asyncio.sleep(self._backoff_delay(attempt))
+
+        raise COCAPIError(f"request failed after {self.max_retries + 1} attempts; last_exc={last_exc}")
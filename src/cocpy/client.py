@@ -1,13 +1,272 @@
 from __future__ import annotations
 
+import functools
+import inspect
+import random
+import threading
 import time
-from typing import Any, Dict, Optional, List
-from urllib.parse import quote
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, List, Tuple, TypeVar
+from urllib.parse import quote, urlencode
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar, merge_cookies
+from requests.sessions import merge_setting
+
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - optional dependency
+    import json as _json
+    _loads = _json.loads
+    _dumps = _json.dumps
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
 
 from .errors import COCAPIError, RateLimitError, NotFoundError, AuthError
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+_random = random.Random()  # seeded once from os.urandom
+
+# error statuses with a dedicated exception; any other >= 400 is COCAPIError
+_STATUS_ERRORS = {401: AuthError, 403: AuthError, 404: NotFoundError}
+
+# transport failures worth another attempt, including bodies cut off mid-read
+_RETRY_EXCEPTIONS = (
+    requests.Timeout,
+    requests.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    urllib3.exceptions.ProtocolError,
+)
+
+
+def _opt_int(value: Any) -> Optional[int]:
+    return None if value is None else int(value)
+
+
+def _ttl_cache(ttl: float) -> Callable[[F], F]:
+    """
+    Memoize a read-mostly endpoint on its client for `ttl` seconds, so
+    repeat calls skip the network entirely. Off when the client is built
+    with cache=False. Works for both sync and async methods. Results are
+    stored encoded, so every hit decodes a fresh dict the caller may modify.
+    """
+
+    def deco(fn: F) -> F:
+        def key_of(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, ...]:
+            return fn.__name__, args, tuple(sorted(kwargs.items()))
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+                if self._memo is None:
+                    return await fn(self, *args, **kwargs)
+                key = key_of(args, kwargs)
+                hit = self._memo.get(key, ttl)
+                if hit is not None:
+                    return _loads(hit)
+                result = await fn(self, *args, **kwargs)
+                self._memo.put(key, _dumps(result))
+                return result
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if self._memo is None:
+                return fn(self, *args, **kwargs)
+            key = key_of(args, kwargs)
+            hit = self._memo.get(key, ttl)
+            if hit is not None:
+                return _loads(hit)
+            result = fn(self, *args, **kwargs)
+            self._memo.put(key, _dumps(result))
+            return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
+
+
+class _Memo:
+    """
+    Bounded LRU of encoded results for _ttl_cache, keyed by method and
+    arguments. Expired entries are dropped when looked up, and the least
+    recently used one is evicted once maxsize is reached, so paging through
+    many cursors cannot grow it without limit.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[Any, ...], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Tuple[Any, ...], ttl: float) -> Any:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return None
+            if time.monotonic() - hit[0] >= ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def put(self, key: Tuple[Any, ...], value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class _ETagCache:
+    """
+    Bounded LRU of (etag, raw body) per GET request, used to send
+    If-None-Match and decode the stored body again on 304 Not Modified.
+    """
+
+    def __init__(self, maxsize: int = 512) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return method, url
+
+    def get(self, key: Tuple[str, str]) -> Optional[Tuple[str, bytes]]:
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None:
+                self._data.move_to_end(key)
+            return hit
+
+    def put(self, key: Tuple[str, str], etag: str, body: bytes) -> None:
+        with self._lock:
+            self._data[key] = (etag, body)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class ItemStream:
+    """
+    Iterator over the "items" of a streamed response. It owns the response:
+    the connection goes back to the pool once the items are exhausted, on
+    close() or leaving a `with` block, or when the iterator is garbage
+    collected, even if it was never started.
+    """
+
+    __slots__ = ("_resp", "_items")
+
+    def __init__(self, resp: requests.Response) -> None:
+        self._resp: Optional[requests.Response] = resp
+        resp.raw.decode_content = True  # let urllib3 undo gzip/br
+        self._items = ijson.items(resp.raw, "items.item", use_float=True)
+
+    def __iter__(self) -> ItemStream:
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._resp is None:
+            raise StopIteration
+        try:
+            return next(self._items)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        resp, self._resp = self._resp, None
+        if resp is not None:
+            resp.close()
+
+    def __enter__(self) -> ItemStream:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+@dataclass
+class _TokenBucket:
+    """
+    Client-side rate limiter. Each request takes a token; tokens refill at
+    rate_per_sec up to capacity. The rate adapts AIMD-style: halved on every
+    429, bumped back towards its initial value after a streak of successes.
+    """
+
+    capacity: float
+    tokens: float
+    rate_per_sec: float
+    last_refill: float = field(default_factory=time.monotonic)
+    min_rate: float = 0.5
+    success_streak: int = 0
+    max_rate: float = field(init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    STREAK_TO_GROW = 20
+
+    def __post_init__(self) -> None:
+        self.max_rate = self.rate_per_sec
+        # throttling must never push the rate above the configured one
+        self.min_rate = min(self.min_rate, self.rate_per_sec)
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate_per_sec)
+            self.last_refill = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate_per_sec
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self.rate_per_sec = max(self.min_rate, self.rate_per_sec * 0.5)
+            self.success_streak = 0
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.success_streak += 1
+            if self.success_streak >= self.STREAK_TO_GROW and self.rate_per_sec < self.max_rate:
+                self.rate_per_sec = min(self.max_rate, self.rate_per_sec + 1.0)
+                self.success_streak = 0
+
+
+def _make_bucket(rate_limit: Optional[float]) -> Optional[_TokenBucket]:
+    if rate_limit is None:
+        return None
+    if rate_limit <= 0:
+        raise ValueError("rate_limit must be positive, or None to disable pacing.")
+    burst = max(1.0, rate_limit)
+    return _TokenBucket(capacity=burst, tokens=burst, rate_per_sec=rate_limit)
+
 
 class COCClient:
     """
@@ -15,8 +274,29 @@ class COCClient:
 
     Base URL: https://api.clashofclans.com/v1
     Auth: Bearer JWT from https://developer.clashofclans.com
+
+    Connections are pooled and kept alive, so reuse a single instance for
+    the lifetime of the process instead of creating one per call.
     """
 
+    __slots__ = (
+        "base_url",
+        "timeout",
+        "max_retries",
+        "backoff",
+        "max_delay",
+        "_cache",
+        "_memo",
+        "_inflight",
+        "_inflight_lock",
+        "_bucket",
+        "_players_url",
+        "_clans_url",
+        "_cwl_wars_url",
+        "_session",
+        "_get_template",
+    )
+
     def __init__(
         self,
         token: str,
@@ -25,32 +305,66 @@ class COCClient:
         timeout: float = 10.0,
         max_retries: int = 3,
         backoff: float = 0.75,
+        max_delay: float = 30.0,
         session: Optional[requests.Session] = None,
+        pool_maxsize: int = 32,
+        cache: bool = True,
+        rate_limit: Optional[float] = 10.0,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff = backoff
-        self._session = session or requests.Session()
+        self.max_delay = max_delay
+        self._cache = _ETagCache() if cache else None
+        self._memo = _Memo() if cache else None
+        self._inflight: Dict[Tuple[str, str], List[Any]] = {}  # key -> [Future, followers]
+        self._inflight_lock = threading.Lock()
+        # requests/second paced on our side; None disables the limiter
+        self._bucket = _make_bucket(rate_limit)
+        # prefixes for the tag endpoints, so each call builds its URL in one go
+        self._players_url = self.base_url + "/players/"
+        self._clans_url = self.base_url + "/clans/"
+        self._cwl_wars_url = self.base_url + "/clanwarleagues/wars/"
+        owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            # default pool is 10 connections per host; leave injected sessions alone
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, pool_block=False)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session = session
         self._session.headers.update({
             "Authorization": f"Bearer {token}",
             "Accept": "application/json",
             "Content-Type": "application/json",
+            "Connection": "keep-alive",
             "User-Agent": "cocpy/0.1.0",
         })
 
+        # GETs on our own session skip Session.request(): headers, auth, hooks
+        # and env settings are merged once and each call copies the result.
+        # (template, send settings, session state) is rebuilt as one tuple when
+        # the session's headers/params/auth/hooks/proxies/verify/cert change;
+        # params and cookies are merged on every call. Proxy environment
+        # variables are read when the template is built. Injected sessions
+        # (custom adapters, test doubles) keep .request().
+        self._get_template: Optional[Tuple[requests.PreparedRequest, Dict[str, Any], Tuple[Any, ...]]] = (
+            self._build_get_template() if owns_session else None
+        )
+
     # --- public: players ----------------------------------------------------
 
     def get_player(self, tag: str) -> Dict[str, Any]:
         """GET /players/{playerTag}"""
-        path = f"/players/{self._encode_tag(tag)}"
-        return self._request("GET", path)
+        url = self._players_url + self._encode_tag(tag)
+        return self._request("GET", url, absolute=True)
 
     def verify_player_token(self, tag: str, player_token: str) -> Dict[str, Any]:
         """POST /players/{playerTag}/verifytoken"""
-        path = f"/players/{self._encode_tag(tag)}/verifytoken"
+        url = f"{self._players_url}{self._encode_tag(tag)}/verifytoken"
         payload = {"token": player_token}
-        return self._request("POST", path, json=payload)
+        return self._request("POST", url, json=payload, absolute=True)
 
     # --- public: clans ------------------------------------------------------
 
@@ -70,72 +384,88 @@ class COCClient:
         before: Optional[str] = None,
     ) -> Dict[str, Any]:
         """GET /clans with filters"""
-        params: Dict[str, Any] = {}
-        if name is not None:
-            params["name"] = name
-        if war_frequency is not None:
-            params["warFrequency"] = war_frequency
-        if location_id is not None:
-            params["locationId"] = int(location_id)
-        if min_members is not None:
-            params["minMembers"] = int(min_members)
-        if max_members is not None:
-            params["maxMembers"] = int(max_members)
-        if min_clan_points is not None:
-            params["minClanPoints"] = int(min_clan_points)
-        if min_clan_level is not None:
-            params["minClanLevel"] = int(min_clan_level)
-        if label_ids is not None:
-            params["labelIds"] = label_ids
+        params = self._kv(
+            name=name,
+            warFrequency=war_frequency,
+            locationId=_opt_int(location_id),
+            minMembers=_opt_int(min_members),
+            maxMembers=_opt_int(max_members),
+            minClanPoints=_opt_int(min_clan_points),
+            minClanLevel=_opt_int(min_clan_level),
+            labelIds=label_ids,
+        )
         params.update(self._paging_params(limit=limit, after=after, before=before))
         return self._request("GET", "/clans", params=params or None)
 
     def get_clan(self, tag: str) -> Dict[str, Any]:
         """GET /clans/{clanTag}"""
-        return self._request("GET", f"/clans/{self._encode_tag(tag)}")
+        return self._request("GET", f"{self._clans_url}{self._encode_tag(tag)}", absolute=True)
 
     def list_clan_members(
         self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
     ) -> Dict[str, Any]:
         """GET /clans/{clanTag}/members"""
         params = self._paging_params(limit=limit, after=after, before=before)
-        return self._request("GET", f"/clans/{self._encode_tag(tag)}/members", params=params or None)
+        return self._request("GET", f"{self._clans_url}{self._encode_tag(tag)}/members", params=params or None, absolute=True)
+
+    def iter_clan_members(
+        self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> ItemStream:
+        """GET /clans/{clanTag}/members, streaming one member at a time (needs ijson)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return self._iter_items(f"{self._clans_url}{self._encode_tag(tag)}/members", params=params or None, absolute=True)
 
     def get_clan_warlog(
         self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
     ) -> Dict[str, Any]:
         """GET /clans/{clanTag}/warlog"""
         params = self._paging_params(limit=limit, after=after, before=before)
-        return self._request("GET", f"/clans/{self._encode_tag(tag)}/warlog", params=params or None)
+        return self._request("GET", f"{self._clans_url}{self._encode_tag(tag)}/warlog", params=params or None, absolute=True)
+
+    def iter_clan_warlog(
+        self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> ItemStream:
+        """GET /clans/{clanTag}/warlog, streaming one war at a time (needs ijson)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return self._iter_items(f"{self._clans_url}{self._encode_tag(tag)}/warlog", params=params or None, absolute=True)
 
     def get_current_war(self, tag: str) -> Dict[str, Any]:
         """GET /clans/{clanTag}/currentwar"""
-        return self._request("GET", f"/clans/{self._encode_tag(tag)}/currentwar")
+        return self._request("GET", f"{self._clans_url}{self._encode_tag(tag)}/currentwar", absolute=True)
 
     def get_current_war_league_group(self, tag: str) -> Dict[str, Any]:
         """GET /clans/{clanTag}/currentwar/leaguegroup"""
-        return self._request("GET", f"/clans/{self._encode_tag(tag)}/currentwar/leaguegroup")
+        return self._request("GET", f"{self._clans_url}{self._encode_tag(tag)}/currentwar/leaguegroup", absolute=True)
 
     def get_clan_capital_raid_seasons(
         self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
     ) -> Dict[str, Any]:
         """GET /clans/{clanTag}/capitalraidseasons"""
         params = self._paging_params(limit=limit, after=after, before=before)
-        return self._request("GET", f"/clans/{self._encode_tag(tag)}/capitalraidseasons", params=params or None)
+        return self._request("GET", f"{self._clans_url}{self._encode_tag(tag)}/capitalraidseasons", params=params or None, absolute=True)
+
+    def iter_clan_capital_raid_seasons(
+        self, tag: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> ItemStream:
+        """GET /clans/{clanTag}/capitalraidseasons, streaming one season at a time (needs ijson)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return self._iter_items(f"{self._clans_url}{self._encode_tag(tag)}/capitalraidseasons", params=params or None, absolute=True)
 
     # --- public: clan war leagues ------------------------------------------
 
     def get_cwl_war(self, war_tag: str) -> Dict[str, Any]:
         """GET /clanwarleagues/wars/{warTag}"""
-        return self._request("GET", f"/clanwarleagues/wars/{self._encode_tag(war_tag)}")
+        return self._request("GET", f"{self._cwl_wars_url}{self._encode_tag(war_tag)}", absolute=True)
 
     # --- public: leagues ----------------------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def list_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /leagues"""
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", "/leagues", params=params or None)
 
+    @_ttl_cache(ttl=3600)
     def get_league(self, league_id: int | str) -> Dict[str, Any]:
         """GET /leagues/{leagueId}"""
         return self._request("GET", f"/leagues/{league_id}")
@@ -154,46 +484,61 @@ class COCClient:
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", f"/leagues/{league_id}/seasons/{season_id}", params=params or None)
 
+    def iter_league_season_rankings(
+        self, league_id: int | str, season_id: str, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None
+    ) -> ItemStream:
+        """GET /leagues/{leagueId}/seasons/{seasonId}, streaming one ranking at a time (needs ijson)"""
+        params = self._paging_params(limit=limit, after=after, before=before)
+        return self._iter_items(f"/leagues/{league_id}/seasons/{season_id}", params=params or None)
+
     # --- public: war leagues -----------------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def list_war_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /warleagues"""
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", "/warleagues", params=params or None)
 
+    @_ttl_cache(ttl=3600)
     def get_war_league(self, league_id: int | str) -> Dict[str, Any]:
         """GET /warleagues/{leagueId}"""
         return self._request("GET", f"/warleagues/{league_id}")
 
     # --- public: capital leagues -------------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def list_capital_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /capitalleagues"""
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", "/capitalleagues", params=params or None)
 
+    @_ttl_cache(ttl=3600)
     def get_capital_league(self, league_id: int | str) -> Dict[str, Any]:
         """GET /capitalleagues/{leagueId}"""
         return self._request("GET", f"/capitalleagues/{league_id}")
 
     # --- public: builder base leagues --------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def list_builder_base_leagues(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /builderbaseleagues"""
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", "/builderbaseleagues", params=params or None)
 
+    @_ttl_cache(ttl=3600)
     def get_builder_base_league(self, league_id: int | str) -> Dict[str, Any]:
         """GET /builderbaseleagues/{leagueId}"""
         return self._request("GET", f"/builderbaseleagues/{league_id}")
 
     # --- public: locations --------------------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def list_locations(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /locations"""
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", "/locations", params=params or None)
 
+    @_ttl_cache(ttl=3600)
     def get_location(self, location_id: int | str) -> Dict[str, Any]:
         """GET /locations/{locationId}"""
         return self._request("GET", f"/locations/{location_id}")
@@ -252,11 +597,13 @@ class COCClient:
 
     # --- public: labels -----------------------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def list_player_labels(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /labels/players"""
         params = self._paging_params(limit=limit, after=after, before=before)
         return self._request("GET", "/labels/players", params=params or None)
 
+    @_ttl_cache(ttl=3600)
     def list_clan_labels(self, *, limit: Optional[int] = None, after: Optional[str] = None, before: Optional[str] = None) -> Dict[str, Any]:
         """GET /labels/clans"""
         params = self._paging_params(limit=limit, after=after, before=before)
@@ -264,6 +611,7 @@ class COCClient:
 
     # --- public: gold pass --------------------------------------------------
 
+    @_ttl_cache(ttl=3600)
     def get_current_goldpass_season(self) -> Dict[str, Any]:
         """GET /goldpass/seasons/current"""
         return self._request("GET", "/goldpass/seasons/current")
@@ -271,71 +619,226 @@ class COCClient:
     # --- internals ----------------------------------------------------------
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def _encode_tag(tag: str) -> str:
         """
         API expects %23<UPPERCASE_TAG> in the path.
         Accepts '#ABCD' or 'ABCD'.
         """
         t = tag.strip().upper().lstrip("#")
+        if t.isascii() and t.isalnum():  # real tags are [0-9A-Z]+, nothing to quote
+            return "%23" + t
         return f"%23{quote(t, safe='')}"
 
+    @staticmethod
+    def _kv(**items: Any) -> Dict[str, Any]:
+        """Keyword arguments as a params dict, without the ones left as None."""
+        return {k: v for k, v in items.items() if v is not None}
+
     @staticmethod
     def _paging_params(*, limit: Optional[int], after: Optional[str], before: Optional[str]) -> Dict[str, Any]:
-        params: Dict[str, Any] = {}
-        if limit is not None:
-            params["limit"] = int(limit)
         if after is not None and before is not None:
             raise ValueError("Specify only one of 'after' or 'before'.")
-        if after is not None:
-            params["after"] = after
-        if before is not None:
-            params["before"] = before
-        return params
+        return COCClient._kv(limit=_opt_int(limit), after=after, before=before)
 
     def _request(
         self,
         method: str,
         path: str,
         params: Optional[Dict[str, Any]] = None,
-        json: Optional[Dict[str, Any]] = None
+        json: Optional[Dict[str, Any]] = None,
+        absolute: bool = False,
     ) -> Dict[str, Any]:
-        url = self.base_url + path
+        """`path` is relative to base_url unless `absolute` is set."""
+        url = path if absolute else self.base_url + path
+        if method != "GET":
+            return self._fetch(method, url, params, json)
+
+        # single-flight: concurrent identical GETs share one round trip.
+        # When followers joined, the leader hands them the result encoded,
+        # before its own caller can modify it; each follower decodes a copy.
+        key = _ETagCache.key(method, url, params)
+        with self._inflight_lock:
+            entry = self._inflight.get(key)
+            leader = entry is None
+            if leader:
+                entry = self._inflight[key] = [Future(), 0]
+            else:
+                entry[1] += 1
+        future = entry[0]
+        if not leader:
+            return _loads(future.result())
+        try:
+            data = self._fetch(method, url, params, None)
+        except BaseException as e:
+            with self._inflight_lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._inflight_lock:
+            del self._inflight[key]
+            shared = entry[1] > 0
+        future.set_result(_dumps(data) if shared else None)
+        return data
+
+    def _fetch(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        cache_key = _ETagCache.key(method, url, params) if self._cache is not None and method == "GET" else None
+        cached = self._cache.get(cache_key) if cache_key is not None else None
+        headers = {"If-None-Match": cached[0]} if cached else None
+
+        resp = self._send(method, url, params=params, json=json, headers=headers)
+        if resp.status_code == 304 and cached:
+            return _loads(cached[1])
+        body = resp.content
+        etag = resp.headers.get("etag")
+        if cache_key is not None and etag:
+            self._cache.put(cache_key, etag, body)
+        return _loads(body)
+
+    def _iter_items(
+        self, path: str, params: Optional[Dict[str, Any]] = None, absolute: bool = False
+    ) -> ItemStream:
+        """
+        GET a paginated listing and return an iterator over its "items",
+        parsed incrementally from the socket instead of buffering the body.
+        """
+        if ijson is None:
+            raise ImportError('streaming requires ijson: pip install "cocpysdk[stream]"')
+        url = path if absolute else self.base_url + path
+        resp = self._send("GET", url, params=params, stream=True)
+        return ItemStream(resp)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """Send with retries; error statuses are raised as COCAPIError subclasses."""
         last_exc: Optional[Exception] = None
 
         for attempt in range(self.max_retries + 1):
+            if self._bucket is not None:
+                self._bucket.acquire()
             try:
-                resp = self._session.request(
-                    method, url, params=params, json=json, timeout=self.timeout
-                )
-                if resp.status_code == 429:
+                resp = self._send_once(method, url, params, json, headers, stream)
+                status = resp.status_code
+                if status < 400:
+                    if self._bucket is not None:
+                        self._bucket.on_success()
+                    return resp
+
+                if status == 429:
+                    if self._bucket is not None:
+                        self._bucket.on_throttled()
+                    if stream:
+                        resp.close()  # hand the connection back before retrying
                     if attempt == self.max_retries:
                         raise RateLimitError("Rate limit exceeded")
-                    delay = self._parse_retry_after(resp.headers.get("Retry-After")) or self.backoff * (2 ** attempt)
+                    delay = self._parse_retry_after(resp.headers.get("retry-after")) or self._backoff_delay(attempt)
                     time.sleep(delay)
                     continue
 
-                if resp.status_code in (401, 403):
-                    raise AuthError(resp.text)
-                if resp.status_code == 404:
-                    raise NotFoundError(resp.text)
-                if resp.status_code >= 400:
-                    raise COCAPIError(f"{resp.status_code}: {resp.text}")
+                if status >= 500 and attempt < self.max_retries:
+                    if stream:
+                        resp.close()
+                    time.sleep(self._backoff_delay(attempt))
+                    continue
 
-                return resp.json()
+                text = resp.text
+                exc = _STATUS_ERRORS.get(status)
+                if exc is not None:
+                    raise exc(text)
+                raise COCAPIError(f"{status}: {text}")
 
-            except (requests.Timeout, requests.ConnectionError) as e:
+            except _RETRY_EXCEPTIONS as e:
                 last_exc = e
                 if attempt == self.max_retries:
                     raise COCAPIError(str(e)) from e
-                time.sleep(self.backoff * (2 ** attempt))
+                time.sleep(self._backoff_delay(attempt))
 
-        assert False, f"unreachable; last_exc={last_exc}"
+        raise COCAPIError(f"request failed after {self.max_retries + 1} attempts; last_exc={last_exc}")
+
+    def _send_once(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        json: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        stream: bool,
+    ) -> requests.Response:
+        built = self._get_template
+        if built is not None and method == "GET":
+            if self._session_state() != built[2]:
+                built = self._get_template = self._build_get_template()
+            template, settings, _ = built
+            req = template.copy()
+            try:
+                req.prepare_url(url, merge_setting(params, self._session.params))
+            except requests.RequestException:
+                req = None  # let Session.request() produce the usual error
+            if req is not None:
+                if headers:
+                    req.headers.update(headers)
+                # after prepare_url: the Cookie header depends on the URL; an
+                # explicit Cookie in session.headers wins, as in Session.request()
+                req.prepare_cookies(merge_cookies(RequestsCookieJar(), self._session.cookies))
+                return self._session.send(req, timeout=self.timeout, stream=stream, **settings)
+        return self._session.request(
+            method, url, params=params, json=json, headers=headers, timeout=self.timeout, stream=stream
+        )
+
+    def _session_state(self) -> Tuple[Any, ...]:
+        """What the GET template was built from, besides cookies."""
+        s = self._session
+        return (
+            tuple(s.headers.items()),
+            tuple(s.params.items()),
+            s.auth,
+            tuple((event, tuple(hooks)) for event, hooks in s.hooks.items()),
+            tuple(s.proxies.items()),
+            s.verify,
+            s.cert,
+        )
+
+    def _build_get_template(self) -> Tuple[requests.PreparedRequest, Dict[str, Any], Tuple[Any, ...]]:
+        """Build (template, send settings, session state) in one go, for a single assignment."""
+        state = self._session_state()
+        template = self._session.prepare_request(requests.Request("GET", self.base_url))
+        if "Cookie" not in self._session.headers:
+            template.headers.pop("Cookie", None)  # set per call from the live jar
+        settings = self._session.merge_environment_settings(self.base_url, {}, None, None, None)
+        settings.pop("stream", None)
+        return template, settings, state
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, capped at max_delay."""
+        return _random.uniform(0, min(self.max_delay, self.backoff * (2 ** attempt)))
 
     @staticmethod
     def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either delay-seconds or an HTTP-date (RFC 7231)."""
         if not value:
             return None
         try:
             return float(value)
         except ValueError:
-            return None
\ No newline at end of file
+            pass
+        try:
+            dt = parsedate_to_datetime(value)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+        except Exception:
+            return None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+import urllib3.util.connection as _urllib3_connection
+
+
+class _DNSCache:
+    """
+    Small TTL'd LRU in front of socket.getaddrinfo, keyed by its arguments.
+    """
+
+    def __init__(self, ttl: float = 60.0, maxsize: int = 64) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[Any, ...], Tuple[float, List[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def getaddrinfo(self, host: str, port: int, family: int = 0, type: int = 0) -> List[Any]:
+        key = (host, port, family, type)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is not None and hit[0] > now:
+                self._data.move_to_end(key)
+                return hit[1]
+        result = socket.getaddrinfo(host, port, family, type)
+        with self._lock:
+            self._data[key] = (now + self.ttl, result)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return result
+
+
+_cache: Optional[_DNSCache] = None
+_original_create_connection = _urllib3_connection.create_connection
+
+
+def _create_connection(address: Tuple[str, int], *args: Any, **kwargs: Any) -> socket.socket:
+    cache = _cache
+    if cache is None:
+        return _original_create_connection(address, *args, **kwargs)
+    host, port = address
+    if host.startswith("["):
+        host = host.strip("[]")
+    infos = cache.getaddrinfo(host, port, _urllib3_connection.allowed_gai_family(), socket.SOCK_STREAM)
+    err: Optional[OSError] = None
+    for *_, sockaddr in infos:
+        try:
+            # numeric host: urllib3 connects without another DNS lookup;
+            # TLS still verifies against the original hostname
+            return _original_create_connection((sockaddr[0], port), *args, **kwargs)
+        except OSError as e:
+            err = e
+    if err is not None:
+        raise err
+    raise OSError("getaddrinfo returns an empty list")
+
+
+def enable_dns_cache(ttl: float = 60.0, maxsize: int = 64) -> None:
+    """
+    Cache DNS lookups made by requests/urllib3 for `ttl` seconds.
+
+    Process-wide: every new urllib3 connection resolves through the cache,
+    not only COCClient's. Calling it again replaces the cache.
+    """
+    global _cache
+    _cache = _DNSCache(ttl=ttl, maxsize=maxsize)
+    _urllib3_connection.create_connection = _create_connection
+
+
+def disable_dns_cache() -> None:
+    """Restore urllib3's own resolution and drop cached entries."""
+    global _cache
+    _urllib3_connection.create_connection = _original_create_connection
+    _cache = None
@@ -1,3 +1,5 @@
+import io
+import json
 import os
 import pytest
 from dotenv import load_dotenv
@@ -14,4 +16,80 @@ def token():
 
 @pytest.fixture(scope="session")
 def client(token):
-    return COCClient(token, timeout=20.0, max_retries=2, backoff=0.1)
\ No newline at end of file
+    return COCClient(token, timeout=20.0, max_retries=2, backoff=0.1)
+
+
+class FakeResponse:
+    # just what COCClient reads off a requests.Response; header names are
+    # stored lowercased since the client looks them up that way
+    __slots__ = ("status_code", "content", "headers", "raw", "closed")
+
+    def __init__(self, status, payload, headers=None):
+        self.status_code = status
+        self.content = json.dumps(payload or {}).encode()
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.raw = None
+        self.closed = False
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def close(self):
+        self.closed = True
+
+
+class DummySession:
+    # duck-typed stand-in for requests.Session: COCClient only needs
+    # .headers and .request(), so skip Session.__init__ (adapters, cookie jar, ...)
+    def __init__(self, seq=None, status=200, payload=None, headers=None):
+        self.headers = {}
+        # seq = list of tuples (status, payload, headers) consumed in order;
+        # responses are built up front, request() only hands them out
+        self._seq = [FakeResponse(st, pl, hd) for st, pl, hd in seq] if seq else None
+        self._static = FakeResponse(status, payload or {"ok": True}, headers)
+        self.last = None
+
+    def request(self, method, url, **kwargs):
+        self.last = {"method": method, "url": url, "params": kwargs.get("params"), "json": kwargs.get("json"),
+                     "headers": kwargs.get("headers")}
+        r = self._seq.pop(0) if self._seq else self._static
+        if kwargs.get("stream"):
+            r.raw = io.BytesIO(r.content)
+            r.closed = False
+        return r
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+@pytest.fixture
+def mock_session():
+    # the DummySession class itself: call it to build one, or subclass it
+    return DummySession
+
+
+@pytest.fixture
+def make_client():
+    # backoff is pinned so retry paths never sleep; other kwargs go to COCClient
+    def _make(session=None, **kw):
+        kw.setdefault("backoff", 0.0)
+        return COCClient("t", session=session if session is not None else DummySession(), **kw)
+    return _make
+
+
+@pytest.fixture(scope="module")
+def client_sess():
+    # one client/session pair shared by the endpoint table; caching and pacing
+    # are off so every row really reaches the session. Module scope because
+    # that table in test_unit_client.py is its only consumer: the pair lives
+    # as long as that module's tests and no longer.
+    sess = DummySession()
+    c = COCClient("t", base_url="https://api.clashofclans.com/v1", session=sess, cache=False, rate_limit=None)
+    return c, sess
@@ -105,4 +105,13 @@ def test_live_clan_flow_smoke(live_client):
 @pytest.mark.skipif(not os.getenv("COC_WAR_TAG"), reason="imposta COC_WAR_TAG per test CWL")
 def test_live_cwl_single_war(live_client):
     war_tag = os.getenv("COC_WAR_TAG")  # es. #2PQ9URCCJ
-    _assert_dict(live_client.get_cwl_war(war_tag))
\ No newline at end of file
+    _assert_dict(live_client.get_cwl_war(war_tag))
+
+
+def test_live_responses_are_compressed(live_client):
+    # requests advertises br only when brotli/brotlicffi is installed (the "brotli" extra)
+    sess = live_client._session
+    resp = sess.get(live_client.base_url + "/locations", params={"limit": 50}, timeout=live_client.timeout)
+    resp.raise_for_status()
+    advertised = [e.strip() for e in resp.request.headers["Accept-Encoding"].split(",")]
+    assert resp.headers.get("Content-Encoding") in advertised
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from cocpy.async_client import AsyncCOCClient
+from cocpy.errors import COCAPIError, RateLimitError, NotFoundError, AuthError
+
+
+class DummyTransport:
+    def __init__(self, seq=None, status=200, payload=None, headers=None):
+        # seq = list of tuples (status, payload, headers) consumed in order;
+        # bodies are encoded once here, not on every call
+        self._seq = [(st, json.dumps(pl or {}).encode(), hd or {}) for st, pl, hd in seq] if seq else None
+        self._status = status
+        self._encoded = json.dumps(payload or {"ok": True}).encode()
+        self._headers = headers or {}
+        self.calls = []
+
+    def __call__(self, request):
+        # httpx responses are single-use (the stream is consumed), so only the bytes are shared
+        self.calls.append(request)
+        if self._seq:
+            st, body, hd = self._seq.pop(0)
+            return httpx.Response(st, content=body, headers=hd)
+        return httpx.Response(self._status, content=self._encoded, headers=self._headers)
+
+
+def _client(transport, **kw):
+    http = httpx.AsyncClient(transport=httpx.MockTransport(transport))
+    return AsyncCOCClient("t", client=http, **kw)
+
+
+def test_async_paths_params_and_headers():
+    tr = DummyTransport()
+
+    async def run():
+        c = _client(tr)
+        await c.get_player("#ABCD")
+        await c.list_clan_members("#ABCD", limit=1, after="x")
+        await c.verify_player_token("#ABCD", "tok")
+
+    asyncio.run(run())
+    get_player, members, verify = tr.calls
+    assert get_player.url.raw_path == b"/v1/players/%23ABCD"
+    assert get_player.headers["Authorization"] == "Bearer t"
+    assert members.url.path == "/v1/clans/#ABCD/members"
+    assert dict(members.url.params) == {"limit": "1", "after": "x"}
+    assert verify.method == "POST"
+    assert json.loads(verify.content) == {"token": "tok"}
+
+
+def test_async_timeout_applies_to_injected_client():
+    tr = DummyTransport()
+    asyncio.run(_client(tr, timeout=42.0).get_clan("#ABCD"))
+    assert tr.calls[0].extensions["timeout"]["read"] == 42.0
+
+
+def test_async_gather_runs_calls_concurrently():
+    tr = DummyTransport()
+
+    async def run():
+        c = _client(tr)
+        return await asyncio.gather(c.get_clan("#ABCD"), c.list_locations(limit=5), c.get_current_goldpass_season())
+
+    results = asyncio.run(run())
+    assert [r["ok"] for r in results] == [True, True, True]
+    assert len(tr.calls) == 3
+
+
+def test_async_identical_gets_share_one_request():
+    tr = DummyTransport()
+
+    async def run():
+        c = _client(tr)
+        results = await asyncio.gather(c.get_clan("#ABCD"), c.get_clan("#ABCD"), c.get_clan("#OTHER"))
+        return c, results
+
+    c, (a, b, other) = asyncio.run(run())
+    assert len(tr.calls) == 2
+    assert a == b and a is not b
+    assert c._inflight == {}
+
+
+def test_async_error_mapping_401_404_500_429():
+    async def raises(transport, exc, **kw):
+        with pytest.raises(exc):
+            await _client(transport, **kw).list_locations()
+
+    asyncio.run(raises(DummyTransport(status=401), AuthError))
+    asyncio.run(raises(DummyTransport(status=404), NotFoundError))
+    asyncio.run(raises(DummyTransport(status=500), COCAPIError, max_retries=0))
+
+    seq = [(503, {}, {}), (200, {"ok": True}, {})]
+    c = _client(DummyTransport(seq=seq), backoff=0.0, max_retries=1)
+    assert asyncio.run(c.list_locations())["ok"] is True
+
+    seq = [(429, {}, {"Retry-After": "0"}), (429, {}, {"Retry-After": "0"})]
+    asyncio.run(raises(DummyTransport(seq=seq), RateLimitError, backoff=0.0, max_retries=1))
+
+    seq = [(429, {"message": "rate"}, {"Retry-After": "0"}), (200, {"ok": True}, {})]
+    c = _client(DummyTransport(seq=seq), backoff=0.0, max_retries=1)
+    assert asyncio.run(c.list_locations())["ok"] is True
+
+
+def test_async_etag_cache_reuses_body_on_304():
+    tr = DummyTransport(seq=[(200, {"items": [1]}, {"ETag": '"v1"'}), (304, None, {})])
+    c = _client(tr)
+
+    async def run():
+        first = await c.get_clan_warlog("#ABCD")
+        first["items"].append(99)
+        return first, await c.get_clan_warlog("#ABCD")
+
+    _, second = asyncio.run(run())
+    assert second == {"items": [1]}
+    assert tr.calls[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_async_read_mostly_endpoints_are_memoized():
+    tr = DummyTransport()
+    c = _client(tr)
+
+    async def run():
+        return await c.list_locations(limit=5), await c.list_locations(limit=5)
+
+    first, second = asyncio.run(run())
+    assert first == second and first is not second
+    assert len(tr.calls) == 1
+
+
+def test_async_non_positive_rate_limit_is_rejected():
+    with pytest.raises(ValueError):
+        _client(DummyTransport(), rate_limit=0)
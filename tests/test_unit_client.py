@@ -1,163 +1,533 @@
+import gc
 import json
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from urllib.parse import urlparse
 import pytest
-import requests
-from requests.models import Response
 
-from cocpy.client import COCClient
+from cocpy.client import COCClient, _TokenBucket
 from cocpy.errors import COCAPIError, RateLimitError, NotFoundError, AuthError
 
 
-class DummySession(requests.Session):
-    def __init__(self, seq=None, status=200, payload=None, headers=None):
-        super().__init__()
-        # seq = list of tuples (status, payload, headers) consumed in order
-        self._seq = list(seq) if seq else None
-        self._status = status
-        self._payload = payload or {"ok": True}
-        self._headers = headers or {}
-        self.last = None
-
-    def request(self, method, url, **kwargs):
-        self.last = {"method": method, "url": url, "params": kwargs.get("params"), "json": kwargs.get("json")}
-        r = Response()
-        if self._seq is not None and self._seq:
-            st, pl, hd = self._seq.pop(0)
-            r.status_code = st
-            r._content = json.dumps(pl or {}).encode()
-            r.headers.update(hd or {})
-            return r
-        r.status_code = self._status
-        r._content = json.dumps(self._payload).encode()
-        r.headers.update(self._headers)
-        return r
+@pytest.fixture(autouse=True)
+def _no_sleep(request, monkeypatch):
+    # retries and pacing never really sleep in unit tests; opt out with
+    # @pytest.mark.real_sleep. Recorded delays must stay small.
+    if request.node.get_closest_marker("real_sleep"):
+        yield None
+        return
+    calls = []
+    monkeypatch.setattr("cocpy.client.time.sleep", calls.append)
+    yield calls
+    assert all(d <= 1.0 for d in calls), calls
 
 
 def _path(url):
-    u = urlparse(url)
-    return u.path
+    # all test URLs are absolute https://host/...; cheaper than urlparse
+    return "/" + url.partition("://")[2].partition("/")[2].partition("?")[0]
+
 
+@pytest.mark.parametrize("url", [
+    "https://api.clashofclans.com/v1/players/%23ABCD",
+    "https://api.clashofclans.com/v1/clans?name=abc&limit=3",
+    "https://api.clashofclans.com/",
+])
+def test_path_helper_matches_urlparse(url):
+    assert _path(url) == urlparse(url).path
 
-def test_tag_encoding():
-    c = COCClient("t", session=DummySession())
+
+def test_tag_encoding(make_client):
+    c = make_client()
     assert c._encode_tag("#2abc") == "%232ABC"
     assert c._encode_tag("2abc") == "%232ABC"
+    assert c._encode_tag(" #2abc ") == "%232ABC"
+    assert c._encode_tag("#a/b c") == "%23A%2FB%20C"
 
 
-def test_error_mapping_401_404_500_429():
-    # 401/403 -> AuthError
-    c = COCClient("t", session=DummySession(status=401))
-    with pytest.raises(AuthError):
-        c.get_player("#AAAA")
+def test_default_session_pools_keep_alive_connections():
+    c = COCClient("t", pool_maxsize=16)
+    adapter = c._session.get_adapter("https://api.clashofclans.com/v1")
+    assert adapter._pool_maxsize == 16
+    assert c._session.headers["Connection"] == "keep-alive"
 
-    # 404 -> NotFoundError
-    c = COCClient("t", session=DummySession(status=404))
-    with pytest.raises(NotFoundError):
-        c.get_location(1)
 
-    # 500 -> COCAPIError
-    c = COCClient("t", session=DummySession(status=500))
-    with pytest.raises(COCAPIError):
+def test_client_uses_slots(make_client):
+    c = make_client()
+    assert not hasattr(c, "__dict__")
+
+
+def test_injected_session_keeps_its_accept_encoding(mock_session, make_client):
+    sess = mock_session()
+    sess.headers["Accept-Encoding"] = "identity"
+    make_client(sess)
+    assert sess.headers["Accept-Encoding"] == "identity"
+
+
+@pytest.fixture
+def recording_client():
+    # a COCClient on its own real requests.Session, with the transport swapped
+    # for an adapter that records what is sent; needs real Response objects
+    from requests.adapters import BaseAdapter
+    from requests.models import Response
+
+    class RecordingAdapter(BaseAdapter):
+        def __init__(self):
+            super().__init__()
+            self.sent = []
+
+        def send(self, request, **kwargs):
+            self.sent.append((request, kwargs))
+            r = Response()
+            r.status_code = 200
+            r._content = b'{"ok": true}'
+            r.request = request
+            r.url = request.url
+            return r
+
+        def close(self):
+            pass
+
+    c = COCClient("t", cache=False)
+    adapter = RecordingAdapter()
+    c._session.mount("https://", adapter)
+    return c, adapter
+
+
+def test_own_session_sends_gets_from_prepared_template(recording_client):
+    c, adapter = recording_client
+    assert c.get_clan_warlog("#ABCD", limit=2)["ok"] is True
+    assert c.get_clan_warlog("#EFGH")["ok"] is True
+    c.verify_player_token("#ABCD", "tok")
+    (first, kw), (second, _), (post, _) = adapter.sent
+    assert first.url == "https://api.clashofclans.com/v1/clans/%23ABCD/warlog?limit=2"
+    assert second.url == "https://api.clashofclans.com/v1/clans/%23EFGH/warlog"
+    assert first.headers["Authorization"] == "Bearer t"
+    assert first is not second and first is not c._get_template[0]
+    assert kw["timeout"] == c.timeout
+    assert post.method == "POST" and json.loads(post.body) == {"token": "tok"}
+
+
+def test_prepared_template_follows_later_session_changes(recording_client):
+    c, adapter = recording_client
+    c.get_clan("#ABCD")
+    c._session.cookies.set("lb", "x")
+    c._session.headers["X-Trace"] = "1"
+    c.get_clan("#ABCD")
+    c.verify_player_token("#ABCD", "tok")
+    (before, _), (get, _), (post, _) = adapter.sent
+    assert "Cookie" not in before.headers
+    assert get.headers["Cookie"] == post.headers["Cookie"] == "lb=x"
+    assert get.headers["X-Trace"] == "1"
+
+
+def test_prepared_template_merges_session_params(recording_client):
+    c, adapter = recording_client
+    c._session.params = {"lang": "it"}
+    c.get_clan_warlog("#ABCD", limit=2)
+    c.verify_player_token("#ABCD", "tok")
+    (get, _), (post, _) = adapter.sent
+    assert get.url == "https://api.clashofclans.com/v1/clans/%23ABCD/warlog?lang=it&limit=2"
+    assert post.url.endswith("?lang=it")
+
+
+def test_prepared_template_keeps_explicit_cookie_header(recording_client):
+    c, adapter = recording_client
+    c._session.headers["Cookie"] = "manual=1"
+    c._session.cookies.set("lb", "x")
+    c.get_clan("#ABCD")
+    c.verify_player_token("#ABCD", "tok")
+    (get, _), (post, _) = adapter.sent
+    assert get.headers["Cookie"] == post.headers["Cookie"] == "manual=1"
+
+
+def test_prepared_template_picks_up_new_hooks(recording_client):
+    c, adapter = recording_client
+    c.get_clan("#ABCD")
+    seen = []
+    c._session.hooks["response"].append(lambda r, **kw: seen.append(r.url))
+    c.get_clan("#EFGH")
+    assert seen == ["https://api.clashofclans.com/v1/clans/%23EFGH"]
+
+
+def test_prepared_template_rebuild_pairs_template_with_settings(recording_client):
+    c, adapter = recording_client
+    c.get_clan("#ABCD")
+    c._session.cert = "client.pem"
+    c.get_clan("#EFGH")
+    (_, before), (_, after) = adapter.sent
+    _, settings, _ = c._get_template
+    assert before["cert"] is None
+    assert after["cert"] == settings["cert"] == "client.pem"
+
+
+def test_injected_session_keeps_request_path(mock_session, make_client):
+    sess = mock_session()
+    c = make_client(sess)
+    assert c._get_template is None
+    c.get_clan("#ABCD")
+    assert sess.last["method"] == "GET"
+
+
+@pytest.mark.parametrize(
+    "status,exc",
+    [(401, AuthError), (403, AuthError), (404, NotFoundError), (500, COCAPIError)],
+)
+def test_error_mapping(status, exc, mock_session, make_client):
+    c = make_client(mock_session(status=status), max_retries=0)
+    with pytest.raises(exc):
         c.list_locations()
 
-    # 429 then success -> handled with backoff
+
+def test_429_retry_then_success(_no_sleep, mock_session, make_client):
     seq = [(429, {"message": "rate"}, {"Retry-After": "0"}), (200, {"ok": True}, {})]
-    c = COCClient("t", session=DummySession(seq=seq), backoff=0.0, max_retries=1)
+    c = make_client(mock_session(seq=seq), max_retries=1)
     assert c.list_locations()["ok"] is True
+    assert _no_sleep == [0.0]
+
 
-    # 429 exceeding retries -> RateLimitError
+def test_429_exhausted(mock_session, make_client):
     seq = [(429, {}, {"Retry-After": "0"}), (429, {}, {"Retry-After": "0"})]
-    c = COCClient("t", session=DummySession(seq=seq), backoff=0.0, max_retries=1)
+    c = make_client(mock_session(seq=seq), max_retries=1)
     with pytest.raises(RateLimitError):
         c.list_locations()
 
 
-@pytest.mark.parametrize(
-    "call,expected_path,expected_params,expected_json",
-    [
-        # players
-        (lambda c: c.get_player("#ABCD"), "/v1/players/%23ABCD", None, None),
-        (lambda c: c.verify_player_token("#ABCD", "tok"), "/v1/players/%23ABCD/verifytoken", None, {"token": "tok"}),
-
-        # clans
-        (lambda c: c.search_clans(name="abc", min_members=5, max_members=10, min_clan_level=2, limit=3),
-         "/v1/clans", {"name": "abc", "minMembers": 5, "maxMembers": 10, "minClanLevel": 2, "limit": 3}, None),
-        (lambda c: c.get_clan("#ABCD"), "/v1/clans/%23ABCD", None, None),
-        (lambda c: c.list_clan_members("#ABCD", limit=1, after="x"),
-         "/v1/clans/%23ABCD/members", {"limit": 1, "after": "x"}, None),
-        (lambda c: c.get_clan_warlog("#ABCD", limit=2, before="y"),
-         "/v1/clans/%23ABCD/warlog", {"limit": 2, "before": "y"}, None),
-        (lambda c: c.get_current_war("#ABCD"), "/v1/clans/%23ABCD/currentwar", None, None),
-        (lambda c: c.get_current_war_league_group("#ABCD"), "/v1/clans/%23ABCD/currentwar/leaguegroup", None, None),
-        (lambda c: c.get_clan_capital_raid_seasons("#ABCD", limit=1),
-         "/v1/clans/%23ABCD/capitalraidseasons", {"limit": 1}, None),
-
-        # CWL
-        (lambda c: c.get_cwl_war("#WAR123"), "/v1/clanwarleagues/wars/%23WAR123", None, None),
-
-        # leagues
-        (lambda c: c.list_leagues(limit=5), "/v1/leagues", {"limit": 5}, None),
-        (lambda c: c.get_league(123), "/v1/leagues/123", None, None),
-        (lambda c: c.get_league_seasons(123, limit=1), "/v1/leagues/123/seasons", {"limit": 1}, None),
-        (lambda c: c.get_league_season_rankings(123, "2025-09", limit=1),
-         "/v1/leagues/123/seasons/2025-09", {"limit": 1}, None),
-
-        # war leagues
-        (lambda c: c.list_war_leagues(limit=5), "/v1/warleagues", {"limit": 5}, None),
-        (lambda c: c.get_war_league(15), "/v1/warleagues/15", None, None),
-
-        # capital leagues
-        (lambda c: c.list_capital_leagues(limit=5), "/v1/capitalleagues", {"limit": 5}, None),
-        (lambda c: c.get_capital_league(3), "/v1/capitalleagues/3", None, None),
-
-        # builder base leagues
-        (lambda c: c.list_builder_base_leagues(limit=5), "/v1/builderbaseleagues", {"limit": 5}, None),
-        (lambda c: c.get_builder_base_league(7), "/v1/builderbaseleagues/7", None, None),
-
-        # locations
-        (lambda c: c.list_locations(limit=5), "/v1/locations", {"limit": 5}, None),
-        (lambda c: c.get_location(1), "/v1/locations/1", None, None),
-        (lambda c: c.get_location_player_rankings(1, limit=2),
-         "/v1/locations/1/rankings/players", {"limit": 2}, None),
-        (lambda c: c.get_location_player_builder_base_rankings(1, limit=2),
-         "/v1/locations/1/rankings/players-builder-base", {"limit": 2}, None),
-        (lambda c: c.get_location_player_versus_rankings(1, limit=2),
-         "/v1/locations/1/rankings/players-versus", {"limit": 2}, None),
-        (lambda c: c.get_location_clan_rankings(1, limit=2),
-         "/v1/locations/1/rankings/clans", {"limit": 2}, None),
-        (lambda c: c.get_location_clan_builder_base_rankings(1, limit=2),
-         "/v1/locations/1/rankings/clans-builder-base", {"limit": 2}, None),
-        (lambda c: c.get_location_clan_versus_rankings(1, limit=2),
-         "/v1/locations/1/rankings/clans-versus", {"limit": 2}, None),
-        (lambda c: c.get_location_capital_rankings(1, limit=2),
-         "/v1/locations/1/rankings/capitals", {"limit": 2}, None),
-
-        # labels
-        (lambda c: c.list_player_labels(limit=3), "/v1/labels/players", {"limit": 3}, None),
-        (lambda c: c.list_clan_labels(limit=3), "/v1/labels/clans", {"limit": 3}, None),
-
-        # gold pass
-        (lambda c: c.get_current_goldpass_season(), "/v1/goldpass/seasons/current", None, None),
-    ]
-)
-def test_paths_and_params(call, expected_path, expected_params, expected_json):
-    sess = DummySession()
-    c = COCClient("t", base_url="https://api.clashofclans.com/v1", session=sess)
-    res = call(c)
-    assert isinstance(res, dict)
-    assert _path(sess.last["url"]) == expected_path
+# (method, args, kwargs, expected_path, expected_params, expected_json)
+_ENDPOINT_ROWS = [
+    # players
+    ("get_player", ("#ABCD",), {}, "/v1/players/%23ABCD", None, None),
+    ("verify_player_token", ("#ABCD", "tok"), {}, "/v1/players/%23ABCD/verifytoken", None, {"token": "tok"}),
+
+    # clans
+    ("search_clans", (), {"name": "abc", "min_members": 5, "max_members": 10, "min_clan_level": 2, "limit": 3},
+     "/v1/clans", {"name": "abc", "minMembers": 5, "maxMembers": 10, "minClanLevel": 2, "limit": 3}, None),
+    ("get_clan", ("#ABCD",), {}, "/v1/clans/%23ABCD", None, None),
+    ("list_clan_members", ("#ABCD",), {"limit": 1, "after": "x"}, "/v1/clans/%23ABCD/members", {"limit": 1, "after": "x"}, None),
+    ("get_clan_warlog", ("#ABCD",), {"limit": 2, "before": "y"}, "/v1/clans/%23ABCD/warlog", {"limit": 2, "before": "y"}, None),
+    ("get_current_war", ("#ABCD",), {}, "/v1/clans/%23ABCD/currentwar", None, None),
+    ("get_current_war_league_group", ("#ABCD",), {}, "/v1/clans/%23ABCD/currentwar/leaguegroup", None, None),
+    ("get_clan_capital_raid_seasons", ("#ABCD",), {"limit": 1}, "/v1/clans/%23ABCD/capitalraidseasons", {"limit": 1}, None),
+
+    # CWL
+    ("get_cwl_war", ("#WAR123",), {}, "/v1/clanwarleagues/wars/%23WAR123", None, None),
+
+    # leagues
+    ("list_leagues", (), {"limit": 5}, "/v1/leagues", {"limit": 5}, None),
+    ("get_league", (123,), {}, "/v1/leagues/123", None, None),
+    ("get_league_seasons", (123,), {"limit": 1}, "/v1/leagues/123/seasons", {"limit": 1}, None),
+    ("get_league_season_rankings", (123, "2025-09"), {"limit": 1}, "/v1/leagues/123/seasons/2025-09", {"limit": 1}, None),
+
+    # war leagues
+    ("list_war_leagues", (), {"limit": 5}, "/v1/warleagues", {"limit": 5}, None),
+    ("get_war_league", (15,), {}, "/v1/warleagues/15", None, None),
+
+    # capital leagues
+    ("list_capital_leagues", (), {"limit": 5}, "/v1/capitalleagues", {"limit": 5}, None),
+    ("get_capital_league", (3,), {}, "/v1/capitalleagues/3", None, None),
+
+    # builder base leagues
+    ("list_builder_base_leagues", (), {"limit": 5}, "/v1/builderbaseleagues", {"limit": 5}, None),
+    ("get_builder_base_league", (7,), {}, "/v1/builderbaseleagues/7", None, None),
+
+    # locations
+    ("list_locations", (), {"limit": 5}, "/v1/locations", {"limit": 5}, None),
+    ("get_location", (1,), {}, "/v1/locations/1", None, None),
+    ("get_location_player_rankings", (1,), {"limit": 2}, "/v1/locations/1/rankings/players", {"limit": 2}, None),
+    ("get_location_player_builder_base_rankings", (1,), {"limit": 2},
+     "/v1/locations/1/rankings/players-builder-base", {"limit": 2}, None),
+    ("get_location_player_versus_rankings", (1,), {"limit": 2}, "/v1/locations/1/rankings/players-versus", {"limit": 2}, None),
+    ("get_location_clan_rankings", (1,), {"limit": 2}, "/v1/locations/1/rankings/clans", {"limit": 2}, None),
+    ("get_location_clan_builder_base_rankings", (1,), {"limit": 2},
+     "/v1/locations/1/rankings/clans-builder-base", {"limit": 2}, None),
+    ("get_location_clan_versus_rankings", (1,), {"limit": 2}, "/v1/locations/1/rankings/clans-versus", {"limit": 2}, None),
+    ("get_location_capital_rankings", (1,), {"limit": 2}, "/v1/locations/1/rankings/capitals", {"limit": 2}, None),
+
+    # labels
+    ("list_player_labels", (), {"limit": 3}, "/v1/labels/players", {"limit": 3}, None),
+    ("list_clan_labels", (), {"limit": 3}, "/v1/labels/clans", {"limit": 3}, None),
+
+    # gold pass
+    ("get_current_goldpass_season", (), {}, "/v1/goldpass/seasons/current", None, None),
+]
+
+# explicit ids: the method name, stable across runs for -k and --lf;
+# each param is the whole row, as the endpoint fixture unpacks it
+ENDPOINTS = [pytest.param(row, id=row[0]) for row in _ENDPOINT_ROWS]
+
+
+@pytest.fixture(params=ENDPOINTS)
+def endpoint(request, client_sess):
+    # calls one table row on the shared client; each test below checks one property
+    method, args, kwargs, expected_path, expected_params, expected_json = request.param
+    c, sess = client_sess
+    sess.last = None
+    res = getattr(c, method)(*args, **kwargs)
+    return res, sess.last, expected_path, expected_params, expected_json
+
+
+def test_paths_and_params(endpoint):
+    _, last, expected_path, expected_params, expected_json = endpoint
+    assert _path(last["url"]) == expected_path
     if expected_params is None:
-        assert sess.last["params"] in (None, {})
+        assert last["params"] in (None, {})
     else:
-        assert sess.last["params"] == expected_params
+        assert last["params"] == expected_params
     if expected_json is None:
-        assert sess.last["json"] in (None, {})
+        assert last["json"] in (None, {})
     else:
-        assert sess.last["json"] == expected_json
+        assert last["json"] == expected_json
+
+
+def test_endpoint_returns_dict(endpoint):
+    res, *_ = endpoint
+    assert isinstance(res, dict)
+
+
+def test_endpoint_never_sends_both_json_and_params(endpoint):
+    _, last, *_ = endpoint
+    assert not (last["json"] and last["params"])
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    parse = COCClient._parse_retry_after
+    assert parse(None) is None
+    assert parse("1.5") == 1.5
+    assert parse("not a date") is None
+    assert parse("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # already in the past
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25.0 < parse(future) <= 30.0
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 5, 20])
+def test_backoff_delay_is_jittered_and_capped(attempt, make_client):
+    c = make_client(backoff=0.5, max_delay=4.0)
+    for _ in range(50):
+        assert 0.0 <= c._backoff_delay(attempt) <= min(4.0, 0.5 * 2 ** attempt)
+
+
+def test_token_bucket_paces_after_burst():
+    b = _TokenBucket(capacity=2, tokens=2, rate_per_sec=4.0)
+    assert b.reserve() == 0.0
+    assert b.reserve() == 0.0
+    assert b.reserve() == pytest.approx(0.25, abs=0.01)
+
+
+def test_token_bucket_aimd():
+    b = _TokenBucket(capacity=10, tokens=10, rate_per_sec=10.0)
+    b.on_throttled()
+    b.on_throttled()
+    assert b.rate_per_sec == 2.5
+    for _ in range(_TokenBucket.STREAK_TO_GROW):
+        b.on_success()
+    assert b.rate_per_sec == 3.5
+    for _ in range(50 * _TokenBucket.STREAK_TO_GROW):
+        b.on_success()
+    assert b.rate_per_sec == 10.0
+
+
+def test_token_bucket_never_throttles_above_configured_rate():
+    b = _TokenBucket(capacity=1, tokens=1, rate_per_sec=0.2)
+    b.on_throttled()
+    assert b.rate_per_sec == 0.2
+
+
+@pytest.mark.parametrize("rate_limit", [0, -1.0])
+def test_non_positive_rate_limit_is_rejected(make_client, rate_limit):
+    with pytest.raises(ValueError):
+        make_client(rate_limit=rate_limit)
+
+
+def test_429_shrinks_client_rate(mock_session, make_client):
+    seq = [(429, {}, {"Retry-After": "0"}), (200, {"ok": True}, {})]
+    c = make_client(mock_session(seq=seq), max_retries=1, rate_limit=8.0)
+    c.list_locations()
+    assert c._bucket.rate_per_sec == 4.0
+    assert make_client(rate_limit=None)._bucket is None
+
+
+def test_etag_cache_revalidates_and_reuses_body_on_304(mock_session, make_client):
+    seq = [(200, {"items": [1]}, {"ETag": '"v1"'}), (304, None, {})]
+    sess = mock_session(seq=seq)
+    c = make_client(sess)
+    first = c.get_clan_warlog("#ABCD", limit=5)
+    assert sess.last["headers"] is None
+    first["items"].append(99)  # the caller's copy, not the cached body
+    assert c.get_clan_warlog("#ABCD", limit=5) == {"items": [1]}
+    assert sess.last["headers"] == {"If-None-Match": '"v1"'}
+
+
+def test_etag_cache_disabled(mock_session, make_client):
+    seq = [(200, {"items": [1]}, {"ETag": '"v1"'}), (200, {"items": [2]}, {})]
+    sess = mock_session(seq=seq)
+    c = make_client(sess, cache=False)
+    c.list_leagues()
+    assert c.list_leagues() == {"items": [2]}
+    assert sess.last["headers"] is None
+
+
+def test_iter_clan_members_streams_items(mock_session, make_client):
+    pytest.importorskip("ijson")
+    sess = mock_session(payload={"items": [{"tag": "#A"}, {"tag": "#B"}], "paging": {}})
+    c = make_client(sess)
+    members = c.iter_clan_members("#ABCD", limit=2)
+    assert sess.last["params"] == {"limit": 2}
+    assert _path(sess.last["url"]) == "/v1/clans/%23ABCD/members"
+    assert [m["tag"] for m in members] == ["#A", "#B"]
+    assert sess._static.closed
+
+
+def test_iter_closes_response_when_discarded_or_closed(mock_session, make_client):
+    pytest.importorskip("ijson")
+    sess = mock_session(payload={"items": [{"tag": "#A"}, {"tag": "#B"}]})
+    c = make_client(sess)
+    members = c.iter_clan_members("#ABCD")
+    assert not sess._static.closed
+    del members  # never started
+    gc.collect()
+    assert sess._static.closed
+
+    with c.iter_clan_members("#ABCD") as members:
+        assert next(members)["tag"] == "#A"
+    assert sess._static.closed
+    assert list(members) == []
+
+
+def test_iter_raises_status_errors_eagerly(mock_session, make_client):
+    pytest.importorskip("ijson")
+    c = make_client(mock_session(status=403))
+    with pytest.raises(AuthError):
+        c.iter_clan_warlog("#ABCD")
+
+
+def test_5xx_is_retried_then_succeeds(mock_session, make_client):
+    seq = [(503, {}, {}), (502, {}, {}), (200, {"ok": True}, {})]
+    sess = mock_session(seq=seq)
+    c = make_client(sess, max_retries=2)
+    assert c.list_locations()["ok"] is True
+    assert sess._seq == []
+
+
+def test_chunked_encoding_error_is_retried(mock_session, make_client):
+    from requests.exceptions import ChunkedEncodingError
+
+    class FlakySession(mock_session):
+        def __init__(self):
+            super().__init__()
+            self.calls = 0
+
+        def request(self, method, url, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise ChunkedEncodingError("cut off")
+            return super().request(method, url, **kwargs)
+
+    sess = FlakySession()
+    c = make_client(sess, max_retries=1)
+    assert c.get_clan("#ABCD")["ok"] is True
+    assert sess.calls == 2
+
+
+def test_concurrent_identical_gets_share_one_request(monkeypatch, mock_session, make_client):
+    from concurrent.futures import Future
+
+    entered, follower_waiting, release = threading.Event(), threading.Event(), threading.Event()
+
+    class SlowSession(mock_session):
+        calls = 0
+
+        def request(self, method, url, **kwargs):
+            self.calls += 1
+            entered.set()
+            # hold the leader in flight until the follower waits on its future
+            assert release.wait(5)
+            return super().request(method, url, **kwargs)
+
+    class SignallingFuture(Future):
+        def result(self, timeout=None):
+            follower_waiting.set()
+            return super().result(timeout)
+
+    monkeypatch.setattr("cocpy.client.Future", SignallingFuture)
+    sess = SlowSession()
+    c = make_client(sess)
+    results, errors = {}, []
+
+    def get(name):
+        try:
+            results[name] = c.get_clan("#ABCD")
+        except BaseException as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=get, args=("leader",))
+    follower = threading.Thread(target=get, args=("follower",))
+    leader.start()
+    assert entered.wait(5)
+    follower.start()
+    assert follower_waiting.wait(5)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert errors == []
+    assert sess.calls == 1
+    assert results["follower"] == results["leader"]
+    assert results["follower"] is not results["leader"]
+    assert c._inflight == {}
+
+
+def test_post_bypasses_single_flight(mock_session, make_client):
+    sess = mock_session()
+    c = make_client(sess)
+    c.verify_player_token("#ABCD", "tok")
+    assert sess.last["method"] == "POST"
+    assert c._inflight == {}
+
+
+def test_no_attempts_raises_instead_of_returning_none(make_client):
+    c = make_client(max_retries=-1)
+    with pytest.raises(COCAPIError):
+        c.get_player("#ABCD")
+
+
+def test_read_mostly_endpoints_are_memoized_until_ttl(monkeypatch, mock_session, make_client):
+    now = [1000.0]
+    monkeypatch.setattr("cocpy.client.time.monotonic", lambda: now[0])
+    seq = [(200, {"v": 1}, {}), (200, {"v": 2}, {}), (200, {"v": 3}, {})]
+    # no pacing: the bucket's refill clock is bound before the patch above
+    c = make_client(mock_session(seq=seq), rate_limit=None)
+    first = c.list_leagues(limit=5)
+    first["v"] = 99  # modifying a result does not touch the memo
+    assert c.list_leagues(limit=5) == {"v": 1}
+    assert c.list_leagues(limit=1) == {"v": 2}  # different args, different entry
+    now[0] += 3601
+    assert c.list_leagues(limit=5) == {"v": 3}
+
+
+def test_memo_is_bounded_lru(mock_session, make_client):
+    seq = [(200, {"v": i}, {}) for i in range(4)]
+    c = make_client(mock_session(seq=seq), rate_limit=None)
+    c._memo.maxsize = 2
+    for cursor in ("a", "b", "c"):
+        c.list_leagues(after=cursor)
+    assert len(c._memo) == 2
+    assert c.list_leagues(after="c") == {"v": 2}  # still cached
+    assert c.list_leagues(after="a") == {"v": 3}  # evicted, fetched again
+
+
+def test_memoization_is_per_client_and_off_without_cache(mock_session, make_client):
+    a = make_client(mock_session(payload={"who": "a"}))
+    b = make_client(mock_session(payload={"who": "b"}))
+    assert a.get_league(1) == {"who": "a"}
+    assert b.get_league(1) == {"who": "b"}
+
+    sess = mock_session(seq=[(200, {"v": 1}, {}), (200, {"v": 2}, {})])
+    c = make_client(sess, cache=False)
+    c.get_current_goldpass_season()
+    assert c.get_current_goldpass_season() == {"v": 2}
 
 
-def test_paging_guard_raises_on_both_after_before():
-    sess = DummySession()
-    c = COCClient("t", session=sess)
+def test_paging_guard_raises_on_both_after_before(mock_session, make_client):
+    sess = mock_session()
+    c = make_client(sess)
     with pytest.raises(ValueError):
         c.list_locations(limit=1, after="a", before="b")
\ No newline at end of file
@@ -0,0 +1,61 @@
+import socket
+import pytest
+import urllib3.util.connection as urllib3_connection
+
+from cocpy import resolver
+
+
+@pytest.fixture
+def fake_getaddrinfo(monkeypatch):
+    calls = []
+
+    def fake(host, port, family=0, type=0):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.1", port)),
+                (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("10.0.0.2", port))]
+
+    monkeypatch.setattr(resolver.socket, "getaddrinfo", fake)
+    yield calls
+    resolver.disable_dns_cache()
+
+
+def test_dns_cache_hits_until_ttl(fake_getaddrinfo, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(resolver.time, "monotonic", lambda: now[0])
+    cache = resolver._DNSCache(ttl=60.0)
+    cache.getaddrinfo("api.clashofclans.com", 443)
+    cache.getaddrinfo("api.clashofclans.com", 443)
+    assert fake_getaddrinfo == ["api.clashofclans.com"]
+    now[0] += 61.0
+    cache.getaddrinfo("api.clashofclans.com", 443)
+    assert len(fake_getaddrinfo) == 2
+
+
+def test_dns_cache_is_bounded(fake_getaddrinfo):
+    cache = resolver._DNSCache(maxsize=2)
+    for host in ("a", "b", "c"):
+        cache.getaddrinfo(host, 443)
+    cache.getaddrinfo("a", 443)
+    assert fake_getaddrinfo == ["a", "b", "c", "a"]
+
+
+def test_enable_patches_urllib3_and_falls_through_addresses(fake_getaddrinfo, monkeypatch):
+    connected = []
+
+    def fake_connect(address, *args, **kwargs):
+        connected.append(address)
+        if address[0] == "10.0.0.1":
+            raise OSError("unreachable")
+        return "sock"
+
+    monkeypatch.setattr(urllib3_connection, "create_connection", urllib3_connection.create_connection)
+    monkeypatch.setattr(resolver, "_original_create_connection", fake_connect)
+    resolver.enable_dns_cache()
+    assert urllib3_connection.create_connection is resolver._create_connection
+    assert urllib3_connection.create_connection(("api.clashofclans.com", 443)) == "sock"
+    assert urllib3_connection.create_connection(("api.clashofclans.com", 443)) == "sock"
+    assert fake_getaddrinfo == ["api.clashofclans.com"]
+    assert connected[:2] == [("10.0.0.1", 443), ("10.0.0.2", 443)]
+
+    resolver.disable_dns_cache()
+    assert urllib3_connection.create_connection is fake_connect